@@ -59,6 +59,164 @@ def edmonds_karp_capacity(adj, sources, sink):
     return total_flow, residual
 
 
+def prune_dead_nodes(adj, sources, sink):
+    # Keep only nodes reachable from some source and able to reach the sink.
+    # The sink is never expanded by the BFS in edmonds_karp_capacity, so the
+    # forward sweep stops there too.
+    forward = set()
+    q = deque(s for s, _ in sources)
+    while q:
+        u = q.popleft()
+        if u in forward:
+            continue
+        forward.add(u)
+        if u != sink:
+            q.extend(adj.get(u, {}))
+
+    radj = {}
+    for u in adj:
+        for v in adj[u]:
+            radj.setdefault(v, []).append(u)
+    backward = set()
+    q = deque([sink])
+    while q:
+        v = q.popleft()
+        if v in backward:
+            continue
+        backward.add(v)
+        q.extend(radj.get(v, []))
+
+    live = forward & backward
+    pruned = {}
+    for u in adj:
+        if u not in live or u == sink:
+            continue
+        pruned[u] = {v: cap for v, cap in adj[u].items() if v in live}
+    return pruned, [(s, sup) for s, sup in sources if s in live]
+
+
+def contract_chains(adj, sources, sink, full_adj=None):
+    # Replace series chains u -> v1 -> ... -> w, whose inner nodes have exactly one
+    # incoming and one outgoing edge, with a single edge u -> w of min capacity.
+    # A chain is only contracted when it is the only route from u to w, so its flow
+    # can be expanded back unambiguously. The max-flow total is unchanged, but a
+    # contracted chain is one BFS hop, so augmenting paths (and the per-edge flows
+    # reported) may differ from solving the uncontracted graph.
+    # full_adj is the unpruned graph; edges dropped by pruning (e.g. out of the
+    # sink) still count when checking for parallel/antiparallel edges.
+    # Returns (contracted_adj, chains) where chains maps (u, w) -> [u, v1, ..., w].
+    full_adj = adj if full_adj is None else full_adj
+    indeg = {}
+    for u in adj:
+        for v in adj[u]:
+            indeg[v] = indeg.get(v, 0) + 1
+    source_ids = {s for s, _ in sources}
+
+    def inner(v):
+        return v != sink and v not in source_ids and indeg.get(v, 0) == 1 and len(adj.get(v, {})) == 1
+
+    found = {}
+    for u in adj:
+        if inner(u):
+            continue
+        for v in adj[u]:
+            if not inner(v):
+                continue
+            path = [u, v]
+            while inner(path[-1]) and len(path) <= len(adj) + 1:
+                path.append(next(iter(adj[path[-1]])))
+            found.setdefault((u, path[-1]), []).append(path)
+
+    chains = {}
+    for (u, w), paths in found.items():
+        # flows are read back from reverse residuals, so never create an edge
+        # parallel or antiparallel to an existing edge or another chain
+        if len(paths) != 1 or u == w or inner(w):
+            continue
+        if w in full_adj.get(u, {}) or u in full_adj.get(w, {}) or (w, u) in found:
+            continue
+        chains[(u, w)] = paths[0]
+
+    heads = {(path[0], path[1]): key for key, path in chains.items()}
+    removed = {v for path in chains.values() for v in path[1:-1]}
+    contracted = {}
+    for u in adj:
+        if u in removed:
+            continue
+        contracted[u] = {}
+        for v, cap in adj[u].items():
+            key = heads.get((u, v))
+            if key is None:
+                contracted[u][v] = cap
+            else:
+                path = chains[key]
+                contracted[u][key[1]] = min(adj[a][b] for a, b in zip(path, path[1:]))
+    return contracted, chains
+
+
+def split_components(adj, sources, sink):
+    # Sub-networks that only meet at the sink can be solved independently: the
+    # BFS never expands the sink, so augmenting paths never cross between them.
+    parent = {}
+
+    def find(n):
+        parent.setdefault(n, n)
+        while parent[n] != n:
+            parent[n] = parent[parent[n]]
+            n = parent[n]
+        return n
+
+    for s, _ in sources:
+        find(s)
+    for u in adj:
+        find(u)
+        for v in adj[u]:
+            if v != sink:
+                parent[find(v)] = find(u)
+
+    components = {}
+    for u in adj:
+        components.setdefault(find(u), ({}, []))[0][u] = adj[u]
+    for s, sup in sources:
+        components.setdefault(find(s), ({}, []))[1].append((s, sup))
+    return list(components.values())
+
+
+def solve_network(adj, sources, sink):
+    # Prune, contract and decompose the graph, run max-flow per component and
+    # return (total_flow, flow on each edge of adj). Pruned edges carry zero flow.
+    # The total matches edmonds_karp_capacity on adj; because of chain contraction
+    # the per-edge flows are a valid max flow but not necessarily the same one.
+    pruned, live_sources = prune_dead_nodes(adj, sources, sink)
+    contracted, chains = contract_chains(pruned, live_sources, sink, adj)
+
+    total_flow = 0.0
+    residual = {}
+    for comp_adj, comp_sources in split_components(contracted, live_sources, sink):
+        if not comp_sources:
+            continue
+        flow, comp_residual = edmonds_karp_capacity(comp_adj, comp_sources, sink)
+        total_flow += flow
+        for u, nbrs in comp_residual.items():
+            residual.setdefault(u, {}).update(nbrs)
+
+    chain_of = {}
+    for (u, w), path in chains.items():
+        for a, b in zip(path, path[1:]):
+            chain_of[(a, b)] = (u, w)
+
+    edge_flow = {}
+    for u in adj:
+        for v in adj[u]:
+            if v not in pruned.get(u, {}):
+                edge_flow[(u, v)] = 0.0
+                continue
+            a, b = chain_of.get((u, v), (u, v))
+            # flow pushed equals reverse residual at (b,a)
+            edge_flow[(u, v)] = residual.get(b, {}).get(a, 0.0)
+    return total_flow, edge_flow
+
+
 def main():
     data = json.load(sys.stdin)
     nodes = data["nodes"]
@@ -106,7 +264,7 @@ def main():
 
     # Run max flow from sources_list to sink (if sink was split, use in_node(sink) or out_node?)
     sink_node = in_node(sink) if sink in caps and node_type.get(sink) not in ["source", "sink"] else sink
-    maxflow, residual = edmonds_karp_capacity(adj, sources_list, sink_node)
+    maxflow, edge_flow = solve_network(adj, sources_list, sink_node)
 
     # Reconstruct flows on original edges
     flows = []
@@ -115,10 +273,8 @@ def main():
         v_orig = e["to"]
         u = out_node(u_orig) if u_orig in caps and node_type.get(u_orig) not in ["source", "sink"] else u_orig
         v = in_node(v_orig) if v_orig in caps and node_type.get(v_orig) not in ["source", "sink"] else v_orig
-        # flow = capacity - residual_capacity
-        cap = float(e.get("hi", 0.0))
-        # flow pushed equals reverse residual at (v,u)
-        flow_val = residual.get(v, {}).get(u, 0.0)
+        # flows come from solve_network (pruned edges carry zero flow)
+        flow_val = edge_flow.get((u, v), 0.0)
         flows.append({"from": u_orig, "to": v_orig, "flow": round(flow_val, 9)})
 
     # Total flow to sink
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import sys
 import json
+from concurrent.futures import ProcessPoolExecutor
 from pulp import LpProblem, LpVariable, LpMinimize, LpStatus, PULP_CBC_CMD, lpSum
 
 # If you set this True, CASE 2 will be forced to match the exact sample numbers
@@ -10,6 +11,12 @@ FORCE_SAMPLE_OVERRIDE = False
 
 EPS = 1e-9
 
+# Number of worker processes used to solve independent factory components.
+# 1 keeps everything in-process; larger values solve components on a process pool.
+LP_PROCESSES = 1
+
+CASE1_DESCRIPTION = "Spec-accurate: eff = base_cpm * (1+speed) * 60 / time_s; machines = sum(x_r/eff_r)"
+
 
 def solve_lp_for_target(data, target_rate, time_limit=2.0):
     machines = data["machines"]
@@ -106,13 +113,120 @@ def case1_spec_view(data, x_vals, eff_rate):
     per_machine = {k: (round(v, 9) if v is not None else 0.0) for k, v in per_machine.items()}
 
     return {
-        "description": "Spec-accurate: eff = base_cpm * (1+speed) * 60 / time_s; machines = sum(x_r/eff_r)",
+        "description": CASE1_DESCRIPTION,
         "per_recipe_crafts_per_min": per_recipe,
         "per_machine_counts": per_machine,
         "raw_consumption_per_min": raw_consumption
     }
 
 
+def find_components(data):
+    """
+    Split the recipe book into independent sub-factories.
+
+    Recipes, items and machine types are nodes of one graph; a recipe is joined to
+    every item it consumes or produces and to its machine type, so recipes sharing a
+    machine's capacity limit stay in the same component. Returns a list of
+    (recipe_names, item_names) tuples in first-appearance order.
+    """
+    recipes = data["recipes"]
+    raw_caps = data["limits"].get("raw_supply_per_min", {})
+
+    parent = {}
+
+    def find(n):
+        parent.setdefault(n, n)
+        while parent[n] != n:
+            parent[n] = parent[parent[n]]
+            n = parent[n]
+        return n
+
+    def union(a, b):
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[rb] = ra
+
+    for item in raw_caps:
+        find(("item", item))
+    for rname, r in recipes.items():
+        node = ("recipe", rname)
+        find(node)
+        union(node, ("machine", r["machine"]))
+        for item in list(r.get("in", {})) + list(r.get("out", {})):
+            union(node, ("item", item))
+
+    groups = {}
+    for n in list(parent):
+        recs, items = groups.setdefault(find(n), ([], []))
+        if n[0] == "recipe":
+            recs.append(n[1])
+        elif n[0] == "item":
+            items.append(n[1])
+    return list(groups.values())
+
+
+def _component_data(data, recs, items):
+    """Restrict the problem to one component's recipes, machines and raw supplies."""
+    raw_caps = data["limits"].get("raw_supply_per_min", {})
+    used_machines = {data["recipes"][r]["machine"] for r in recs}
+    limits = dict(data["limits"])
+    limits["raw_supply_per_min"] = {i: raw_caps[i] for i in items if i in raw_caps}
+    sub = dict(data)
+    sub["machines"] = {m: v for m, v in data["machines"].items() if m in used_machines}
+    sub["recipes"] = {r: data["recipes"][r] for r in recs}
+    sub["limits"] = limits
+    return sub
+
+
+def _solve_component(args):
+    sub, target_rate, time_limit = args
+    prob, x, eff_rate, _ = solve_lp_for_target(sub, target_rate, time_limit)
+    return LpStatus[prob.status], case1_spec_view(sub, x, eff_rate)
+
+
+def solve_decomposed(data, target_rate, time_limit=2.0, processes=None):
+    """
+    Solve each independent component's LP separately and merge the CASE 1 maps.
+
+    Components share no items or machine types, so the monolithic LP is block
+    diagonal and the merged result matches solving it in one piece. Only a
+    component holding the target item needs the solver: every other component
+    has zero production as a feasible, machine-minimising solution, so its
+    recipes, machines and raw items are reported as zero. time_limit is the
+    budget for the whole call and is split across the components solved.
+    Returns (status, view) where status is "Optimal" only if every component is.
+    """
+    processes = LP_PROCESSES if processes is None else processes
+    target_item = data["target"]["item"]
+    work = [(recs, items) for recs, items in find_components(data) if target_item in items]
+    jobs = [(_component_data(data, recs, items), target_rate, time_limit / len(work))
+            for recs, items in work]
+
+    if processes > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(processes, len(jobs))) as pool:
+            results = list(pool.map(_solve_component, jobs))
+    else:
+        results = [_solve_component(job) for job in jobs]
+
+    status = "Optimal"
+    per_recipe, per_machine, raw_consumption = {}, {}, {}
+    for comp_status, view in results:
+        if comp_status != "Optimal":
+            status = comp_status
+        per_recipe.update(view["per_recipe_crafts_per_min"])
+        per_machine.update(view["per_machine_counts"])
+        raw_consumption.update(view["raw_consumption_per_min"])
+
+    # keep the key order of the input, as the monolithic view does
+    raw_caps = data["limits"].get("raw_supply_per_min", {})
+    return status, {
+        "description": CASE1_DESCRIPTION,
+        "per_recipe_crafts_per_min": {r: per_recipe.get(r, 0.0) for r in data["recipes"]},
+        "per_machine_counts": {m: per_machine.get(m, 0.0) for m in data["machines"]},
+        "raw_consumption_per_min": {i: raw_consumption.get(i, 0.0) for i in raw_caps}
+    }
+
+
 def case2_sample_view(data, target_rate, force_override=False):
     """
     Sample-style CASE 2:
@@ -216,16 +330,13 @@ def main():
     data = json.load(sys.stdin)
     target_rate = data["target"]["rate_per_min"]
 
-    # Solve LP (CASE 1)
-    prob, x, eff_rate, prod_mult = solve_lp_for_target(data, target_rate)
+    # Solve LP per independent component (CASE 1: spec-accurate)
+    status, case1 = solve_decomposed(data, target_rate)
 
-    if LpStatus[prob.status] != "Optimal":
+    if status != "Optimal":
         print(json.dumps({"status": "infeasible", "reason": "LP not optimal"}, indent=2))
         return
 
-    # CASE 1: spec-accurate
-    case1 = case1_spec_view(data, x, eff_rate)
-
     # CASE 2: sample-style (optionally forced)
     case2 = case2_sample_view(data, target_rate, force_override=FORCE_SAMPLE_OVERRIDE)
 
@@ -1,4 +1,6 @@
+import importlib.util
 import json
+import os
 import subprocess
 import pytest
 
@@ -54,3 +56,130 @@ def test_belts_sample():
         assert res_flow["from"] == exp_flow["from"]
         assert res_flow["to"] == exp_flow["to"]
         assert abs(res_flow["flow"] - exp_flow["flow"]) < 1e-6
+
+
+def test_belts_pruned_and_contracted():
+    input_data = {
+      "nodes": [
+        {"id": "s1", "type": "source", "supply": 500},
+        {"id": "s2", "type": "source", "supply": 300},
+        {"id": "a", "type": "normal"},
+        {"id": "b", "type": "normal"},
+        {"id": "c", "type": "normal"},
+        {"id": "d", "type": "normal"},
+        {"id": "dead_end", "type": "normal"},
+        {"id": "orphan", "type": "normal"},
+        {"id": "sink", "type": "sink"}
+      ],
+      "edges": [
+        {"from": "s1", "to": "a", "lo": 0, "hi": 1000},
+        {"from": "a", "to": "b", "lo": 0, "hi": 400},
+        {"from": "b", "to": "sink", "lo": 0, "hi": 1000},
+        {"from": "a", "to": "dead_end", "lo": 0, "hi": 1000},
+        {"from": "orphan", "to": "sink", "lo": 0, "hi": 1000},
+        {"from": "s2", "to": "c", "lo": 0, "hi": 1000},
+        {"from": "c", "to": "d", "lo": 0, "hi": 250},
+        {"from": "d", "to": "sink", "lo": 0, "hi": 1000}
+      ],
+      "caps": {"d": 200}
+    }
+
+    expected_flows = [
+      {"from": "a", "to": "b", "flow": 400},
+      {"from": "b", "to": "sink", "flow": 400},
+      {"from": "c", "to": "d", "flow": 200},
+      {"from": "d", "to": "sink", "flow": 200},
+      {"from": "s1", "to": "a", "flow": 400},
+      {"from": "s2", "to": "c", "flow": 200}
+    ]
+
+    result = run_belts(input_data)
+
+    assert result["status"] == "ok"
+    assert abs(result["max_flow_per_min"] - 600) < 1e-6
+    result_flows = sorted(result["flows"], key=lambda x: (x["from"], x["to"]))
+    assert len(result_flows) == len(expected_flows)
+    for res_flow, exp_flow in zip(result_flows, expected_flows):
+        assert res_flow["from"] == exp_flow["from"]
+        assert res_flow["to"] == exp_flow["to"]
+        assert abs(res_flow["flow"] - exp_flow["flow"]) < 1e-6
+
+
+def test_belts_sink_out_edge_next_to_contracted_chain():
+    # s1 -> n1 -> t is contracted once n0/s0 are pruned; the pruned t -> s1
+    # edge must report zero flow rather than the chain's leftover capacity
+    input_data = {
+      "nodes": [
+        {"id": "s0", "type": "source", "supply": 32},
+        {"id": "s1", "type": "source", "supply": 13},
+        {"id": "n0", "type": "normal"},
+        {"id": "n1", "type": "normal"},
+        {"id": "t", "type": "sink"}
+      ],
+      "edges": [
+        {"from": "s1", "to": "n1", "lo": 0, "hi": 27},
+        {"from": "n1", "to": "t", "lo": 0, "hi": 33},
+        {"from": "t", "to": "s1", "lo": 0, "hi": 11},
+        {"from": "s1", "to": "s0", "lo": 0, "hi": 20},
+        {"from": "n1", "to": "s0", "lo": 0, "hi": 20},
+        {"from": "n1", "to": "n0", "lo": 0, "hi": 20},
+        {"from": "s1", "to": "n0", "lo": 0, "hi": 20},
+        {"from": "s0", "to": "n0", "lo": 0, "hi": 20}
+      ],
+      "caps": {"n0": 21}
+    }
+
+    expected_flows = [
+      {"from": "n1", "to": "t", "flow": 13},
+      {"from": "s1", "to": "n1", "flow": 13}
+    ]
+
+    result = run_belts(input_data)
+
+    assert result["status"] == "ok"
+    assert abs(result["max_flow_per_min"] - 13) < 1e-6
+    result_flows = sorted(result["flows"], key=lambda x: (x["from"], x["to"]))
+    assert len(result_flows) == len(expected_flows)
+    for res_flow, exp_flow in zip(result_flows, expected_flows):
+        assert res_flow["from"] == exp_flow["from"]
+        assert res_flow["to"] == exp_flow["to"]
+        assert abs(res_flow["flow"] - exp_flow["flow"]) < 1e-6
+
+
+def load_belts_module():
+    path = os.path.join(os.path.dirname(__file__), "..", "belts", "main.py")
+    spec = importlib.util.spec_from_file_location("belts_main", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_belts_contracted_solve_matches_plain_max_flow():
+    # n0 -> n3 -> t is contracted into one hop, so the BFS may pick different
+    # augmenting paths; the total must still match and the flows must be valid
+    belts = load_belts_module()
+    adj = {
+      "n2": {"n4": 11, "t": 15},
+      "n1": {"t": 26, "n0": 23},
+      "n0": {"n5": 22, "n2": 32, "n3": 7},
+      "n5": {"n2": 30, "t": 30},
+      "n3": {"t": 24},
+      "n4": {"n0": 25}
+    }
+    sources = [("n0", 16.0), ("n1", 9.0)]
+
+    expected_total, _ = belts.edmonds_karp_capacity(adj, sources, "t")
+    total, edge_flow = belts.solve_network(adj, sources, "t")
+
+    assert abs(total - expected_total) < 1e-6
+    assert edge_flow.keys() == {(u, v) for u in adj for v in adj[u]}
+    balance = {}
+    for (u, v), flow in edge_flow.items():
+        assert -1e-6 <= flow <= adj[u][v] + 1e-6
+        balance[u] = balance.get(u, 0.0) - flow
+        balance[v] = balance.get(v, 0.0) + flow
+    for node, supply in sources:
+        assert -supply - 1e-6 <= balance.pop(node) <= 1e-6
+    assert abs(balance.pop("t") - total) < 1e-6
+    for node, net in balance.items():
+        assert abs(net) < 1e-6
@@ -1,5 +1,8 @@
+import importlib.util
 import json
+import os
 import subprocess
+import sys
 import pytest
 
 def run_factory(input_data):
@@ -70,3 +73,67 @@ def test_factory_sample():
         assert abs(result["per_machine_counts"][key] - value) < 1e-6
     for key, value in expected_output["raw_consumption_per_min"].items():
         assert abs(result["raw_consumption_per_min"][key] - value) < 1e-6
+
+
+def load_factory_module(monkeypatch):
+    path = os.path.join(os.path.dirname(__file__), "..", "factory", "main.py")
+    spec = importlib.util.spec_from_file_location("factory_main", path)
+    module = importlib.util.module_from_spec(spec)
+    # lets the process pool pickle module-level workers; undone after the test
+    monkeypatch.setitem(sys.modules, spec.name, module)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_factory_decomposed_matches_monolithic(monkeypatch):
+    factory = load_factory_module(monkeypatch)
+    input_data = {
+      "machines": {
+        "assembler_1": {"crafts_per_min": 30},
+        "chemical": {"crafts_per_min": 60},
+        "refinery": {"crafts_per_min": 20}
+      },
+      "recipes": {
+        "iron_plate": {"machine": "chemical", "time_s": 3.2, "in": {"iron_ore": 1}, "out": {"iron_plate": 1}},
+        "green_circuit": {"machine": "assembler_1", "time_s": 0.5, "in": {"iron_plate": 1}, "out": {"green_circuit": 1}},
+        "oil_processing": {"machine": "refinery", "time_s": 5, "in": {"crude_oil": 10}, "out": {"petroleum": 4}}
+      },
+      "modules": {"chemical": {"prod": 0.2, "speed": 0.1}},
+      "limits": {
+        "raw_supply_per_min": {"iron_ore": 5000, "crude_oil": 5000, "stone": 100},
+        "max_machines": {"assembler_1": 300, "chemical": 300, "refinery": 10}
+      },
+      "target": {"item": "green_circuit", "rate_per_min": 600}
+    }
+
+    components = factory.find_components(input_data)
+    assert sorted(sorted(recs) for recs, _ in components) == [[], ["green_circuit", "iron_plate"], ["oil_processing"]]
+    assert ([], ["stone"]) in components
+
+    prob, x, eff_rate, _ = factory.solve_lp_for_target(input_data, 600)
+    expected = factory.case1_spec_view(input_data, x, eff_rate)
+
+    # only the component holding the target reaches the solver; the oil and
+    # raw-only stone components are filled with zeros
+    solved = []
+    solve_lp_for_target = factory.solve_lp_for_target
+
+    def counting_solve(sub, target_rate, time_limit=2.0):
+        solved.append((sorted(sub["recipes"]), time_limit))
+        return solve_lp_for_target(sub, target_rate, time_limit)
+
+    monkeypatch.setattr(factory, "solve_lp_for_target", counting_solve)
+
+    for processes in (1, 2):
+        solved.clear()
+        status, result = factory.solve_decomposed(input_data, 600, processes=processes)
+        assert status == "Optimal"
+        assert solved == [(["green_circuit", "iron_plate"], 2.0)]
+        assert result["per_recipe_crafts_per_min"]["oil_processing"] == 0.0
+        assert result["per_machine_counts"]["refinery"] == 0.0
+        assert result["raw_consumption_per_min"]["crude_oil"] == 0.0
+        assert result["raw_consumption_per_min"]["stone"] == 0.0
+        for key in ("per_recipe_crafts_per_min", "per_machine_counts", "raw_consumption_per_min"):
+            assert result[key].keys() == expected[key].keys()
+            for name, value in expected[key].items():
+                assert abs(result[key][name] - value) < 1e-6